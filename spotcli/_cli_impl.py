@@ -0,0 +1,357 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+import click
+import rich.table
+import rich.traceback
+from rich.console import RenderableType
+
+try:
+    from rich.console import Group
+except ImportError:  # rich < 10
+    from rich.console import RenderGroup as Group
+
+import spotcli.configuration
+import spotcli.utils
+from spotcli.configuration.tasks import Result, TargetList, Task
+from spotcli.log import console
+from spotcli.utils.elastigroup import Elastigroup, ElastigroupProcess
+from spotcli.utils.update import print_prologue, print_update_notice
+
+PREFETCH_WORKERS = 16
+
+Row = Tuple[str, ...]
+
+
+@click.command()
+@click.argument("kind", type=click.Choice(("aliases", "scenarios")), required=True)
+@click.option(
+    "-f",
+    "--filter",
+    type=click.STRING,
+    default=[],
+    multiple=True,
+    help="Filter expression",
+)
+def list(kind: str, filter: List[str]) -> None:
+    """List entities.
+
+    KIND is either `aliases` or `scenarios`.
+    """
+    print_prologue()
+    config = spotcli.configuration.load()
+    table = rich.table.Table(title=kind.title(), show_lines=True)
+    if kind == "aliases":
+        table.add_column("Name", style="cyan")
+        table.add_column("Targets", style="green")
+        aliases = config.aliases
+        if filter:
+            matches = spotcli.utils.filter(aliases.keys(), filter)
+            aliases = {k: v for k, v in aliases.items() if k in matches}
+        if not aliases:
+            console.print("No aliases found!")
+            print_update_notice()
+            return
+        for alias in aliases.values():
+            table.add_row(alias.name, "\n".join(alias.targets))
+    else:
+        table.add_column("Name", style="magenta")
+        table.add_column("Description")
+        scenarios = config.scenarios
+        if filter:
+            matches = spotcli.utils.filter(scenarios.keys(), filter)
+            scenarios = {k: v for k, v in scenarios.items() if k in matches}
+        if not scenarios:
+            console.print("No aliases found!")
+            print_update_notice()
+            return
+        for scenario in scenarios.values():
+            table.add_row(scenario.name, scenario.description)
+    console.print(table)
+    print_update_notice()
+
+
+@click.command()
+@click.argument("scenario", type=click.STRING, required=True)
+@click.option(
+    "-y",
+    "--auto-approve",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Skip interactive approval before executing actions",
+)
+@click.option(
+    "--fail-fast",
+    type=click.BOOL,
+    default=None,
+    is_flag=True,
+    help="Stop the scenario on the first failed action",
+)
+def run(scenario: str, auto_approve: bool, fail_fast: Optional[bool]) -> None:
+    """Run a scenario.
+
+    SCENARIO is the name of the scenario to run.
+    """
+    print_prologue()
+    config = spotcli.configuration.load()
+    try:
+        s = config.scenarios[scenario]
+        console.print(
+            f"Loading scenario [bold green]{scenario}[/]"
+            + f" [italic]({s.description})[/]"
+            if s.description
+            else ""
+        )
+    except KeyError:
+        console.print(f"Scenario [bold red]{scenario}[/] not found")
+        sys.exit(1)
+    s.resolve()
+    parts: List[RenderableType] = []
+    for task in s.tasks:
+        table = _make_target_table(f"Going to [bold]{task.kind}[/] these elastigroups:")
+        for row in _target_rows(task.targets):
+            table.add_row(*row)
+        parts.extend((table, "\n"))
+    console.print(Group(*parts))
+    auto_approve or click.confirm("Continue?", abort=True)
+    t_start = time.time()
+    results = s.run(fail_fast)
+    t_end = time.time()
+    duration = t_end - t_start
+    if s.executed == len(s.tasks) and all(exc is None for _, exc in results):
+        console.print(
+            f"\n[bold green]Scenario run complete! Executed {s.executed} tasks in {duration:.2f} seconds."
+        )
+    else:
+        console.print(
+            f"\n[bold yellow]Scenario run finished with errors. Executed {s.executed} of {len(s.tasks)} tasks in {duration:.2f} seconds."
+        )
+    print_update_notice()
+    _exit_on_failures(results)
+
+
+@click.command()
+@click.argument("group", type=click.STRING, required=True)
+@click.option(
+    "-p",
+    "--show-processes",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Show process suspension status",
+)
+def status(group: str, show_processes: bool) -> None:
+    """Get elastigroup status.
+
+    GROUP is elastigroup name, alias or regex.
+    """
+    print_prologue()
+    config = spotcli.configuration.load()
+    targets = TargetList(config.providers["spot"], config.aliases, group)
+    table = _make_target_table("Elastigroup status", show_processes)
+    for row in _target_rows(targets, show_processes):
+        table.add_row(*row)
+    console.print(table)
+    print_update_notice()
+
+
+@click.command()
+@click.argument("group", type=click.STRING, required=True)
+@click.option(
+    "-b",
+    "--batch",
+    type=click.STRING,
+    default="20%",
+    help="Batch size, instances or percentage",
+    show_default=True,
+)
+@click.option(
+    "-g",
+    "--grace",
+    type=click.STRING,
+    default="5m",
+    callback=lambda _1, _2, g: g + "s" if g.isdigit() else g,
+    help="Grace period, number with units (seconds if omitted)",
+    show_default=True,
+)
+@click.option(
+    "-y",
+    "--auto-approve",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Skip interactive approval before executing actions",
+)
+def roll(group: str, batch: str, grace: str, auto_approve: bool) -> None:
+    """Roll an elastigroup.
+
+    GROUP is elastigroup name, alias or regex.
+    """
+    action(
+        action="roll", target=group, batch=batch, grace=grace, auto_approve=auto_approve
+    )
+
+
+@click.command()
+@click.argument("group", type=click.STRING, required=True)
+@click.option(
+    "-p",
+    "--processes",
+    type=click.Choice([p.name for p in ElastigroupProcess]),
+    default=[],
+    multiple=True,
+    required=True,
+    help="Processes to suspend",
+)
+@click.option(
+    "-y",
+    "--auto-approve",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Skip interactive approval before executing actions",
+)
+def suspend(group: str, processes: List[str], auto_approve: bool) -> None:
+    """Suspend a process in an elastigroup.
+
+    GROUP is elastigroup name, alias or regex.
+    """
+    action(
+        action="suspend", target=group, processes=processes, auto_approve=auto_approve
+    )
+
+
+@click.command()
+@click.argument("group", type=click.STRING, required=True)
+@click.option(
+    "-p",
+    "--processes",
+    type=click.Choice([p.name for p in ElastigroupProcess]),
+    default=[],
+    multiple=True,
+    required=True,
+    help="Processes to unsuspend",
+)
+@click.option(
+    "-y",
+    "--auto-approve",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Skip interactive approval before executing actions",
+)
+def unsuspend(group: str, processes: List[str], auto_approve: bool) -> None:
+    """Unsuspend a process in an elastigroup.
+
+    GROUP is elastigroup name, alias or regex.
+    """
+    action(
+        action="unsuspend", target=group, processes=processes, auto_approve=auto_approve
+    )
+
+
+@click.command()
+@click.argument("kind", type=click.Choice(("down", "up")), required=True)
+@click.argument("group", type=click.STRING, required=True)
+@click.option(
+    "-a",
+    "--amount",
+    type=click.STRING,
+    default="10%",
+    help="How many instances to add or remove; amount or percentage",
+    show_default=True,
+)
+@click.option(
+    "-y",
+    "--auto-approve",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Skip interactive approval before executing actions",
+)
+def scale(kind: str, group: str, amount: str, auto_approve: bool) -> None:
+    """Scale an elastigroup up or down.
+
+    KIND is the scaling direction: up or down.
+    GROUP is elastigroup name, alias or regex.
+    """
+    action(
+        action=f"{kind}scale", target=group, amount=amount, auto_approve=auto_approve
+    )
+
+
+def action(action: str, target: str, auto_approve: bool, **kwargs) -> None:
+    print_prologue()
+    config = spotcli.configuration.load()
+    targets = TargetList(config.providers["spot"], config.aliases, [target])
+    task = Task.create(kind=action, targets=targets, **kwargs)  # type: ignore
+    table = _make_target_table(f"Going to [bold]{task.kind}[/] these elastigroups:")
+    for row in _target_rows(task.targets):
+        table.add_row(*row)
+    console.print(table)
+    console.print("\n")
+    auto_approve or click.confirm("Continue?", abort=True)
+    t_start = time.time()
+    results = task.run()
+    t_end = time.time()
+    duration = t_end - t_start
+    if all(exc is None for _, exc in results):
+        console.print(
+            f"\n[bold green]Task run complete! Ran 1 task in {duration:.2f} seconds."
+        )
+    else:
+        console.print(
+            f"\n[bold yellow]Task run finished with errors. Ran 1 task in {duration:.2f} seconds."
+        )
+    print_update_notice()
+    _exit_on_failures(results)
+
+
+def _exit_on_failures(results: List[Result]) -> None:
+    failed = [name for name, exc in results if exc is not None]
+    if failed:
+        # Workers only report a one-line error, tracebacks are rendered here
+        # once all of them are done
+        for name, exc in results:
+            if exc is not None:
+                console.print(f"\n[bold red]Traceback for[/] [bold blue]{name}[/]:")
+                console.print(
+                    rich.traceback.Traceback.from_exception(
+                        type(exc), exc, exc.__traceback__
+                    )
+                )
+        console.print(
+            f"[bold red]ERROR:[/] {len(failed)} of {len(results)} targets failed: "
+            + ", ".join(f"[bold blue]{name}[/]" for name in failed)
+        )
+        sys.exit(1)
+
+
+def _make_target_table(title: str, processes: bool = False) -> rich.table.Table:
+    table = rich.table.Table(title=title, show_lines=True)
+    table.add_column("ID", justify="center", style="cyan")
+    table.add_column("Name", style="magenta")
+    table.add_column("Instances", style="green")
+    if processes:
+        table.add_column("Processes", style="yellow")
+    return table
+
+
+def _target_rows(targets: Iterable[Elastigroup], processes: bool = False) -> List[Row]:
+    """Fetch table rows for elastigroups concurrently, preserving their order."""
+
+    def describe(target: Elastigroup) -> Row:
+        row = (target.id, target.name, str(target.capacity["target"]))
+        if not processes:
+            return row
+        parts = []
+        for proc, state in target.processes.items():
+            color = "green" if "active" in state else "red"
+            parts.append(f"[bold]{proc}[/]: [{color}]{state}[/]")
+        return (*row, "\n".join(parts))
+
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as executor:
+        return [*executor.map(describe, targets)]
@@ -1,24 +1,44 @@
+import glob
+import hashlib
+import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
 import attr
-import rich.console
-from config import ConfigurationSet, config_from_yaml
+import yaml
+from config import Configuration, ConfigurationSet, config_from_dict
 
 from spotcli.configuration.tasks import Alias, Scenario, TargetList, Task
+from spotcli.log import console
 from spotcli.providers import Provider
+from spotcli.providers.file import FileProvider
+from spotcli.utils.compat import cached_property
 
-console = rich.console.Console(highlight=False)
+CONFIG_DIR = os.path.expanduser("~/.spot")
+CACHE_DIR = os.path.join(CONFIG_DIR, ".cache")
+CACHE_TTL = int(os.environ.get("SPOTCLI_CONFIG_CACHE_TTL", 300))
 
+# Prefer libyaml bindings when PyYAML is built with them
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@attr.s(auto_attribs=True)
+
+def parse(config_raw: str) -> Configuration:
+    return config_from_dict(
+        yaml.load(config_raw, Loader=YAML_LOADER) or {}, lowercase_keys=True
+    )
+
+
+@attr.s(auto_attribs=True, slots=True)
 class Source:
     provider: Provider
     path: str
 
     def read(self):
         config_raw = self.provider.get(self.path)
-        config = config_from_yaml(config_raw, lowercase_keys=True)
+        config = parse(config_raw)
         return config
 
 
@@ -36,129 +56,105 @@ class Config:
             )
             sys.exit(1)
 
-    @property
+    @cached_property
     def sources(self):
+        if "sources" not in self.config:
+            return []
         try:
-            sources = getattr(self, "_sources")
-        except AttributeError:
-            sources = []
-            try:
-                for source in self.config.sources:
-                    sources.append(
-                        Source(
-                            provider=self.providers[source["provider"]],
-                            path=source["path"],
-                        )
-                    )
-                setattr(self, "_sources", sources)
-            except KeyError:
-                console.print(
-                    "[bold red]ERROR:[/] Missing [italic]sources[/] in the config"
-                )
-                sys.exit(1)
-        finally:
-            return sources
+            return [
+                Source(provider=self.providers[source["provider"]], path=source["path"])
+                for source in self.config.sources
+            ]
+        except KeyError:
+            console.print(
+                "[bold red]ERROR:[/] Missing [italic]sources[/] in the config"
+            )
+            sys.exit(1)
 
-    @property
+    @cached_property
     def providers(self):
         try:
-            providers = getattr(self, "_providers")
-        except AttributeError:
-            providers = {}
-            try:
-                providers_raw = (
-                    {
-                        p: self.config.providers[p].as_dict()
-                        for p in list(self.config.providers)
-                    }
-                    if "providers" in self.config
-                    else {}
-                )
-            except KeyError:
-                console.print(
-                    "[bold red]ERROR:[/] Missing [italic]providers[/] in the config"
-                )
-                sys.exit(1)
-            for name, provider in providers_raw.items():
-                providers[name] = Provider(name=name, **provider)
-            setattr(self, "_providers", providers)
-        finally:
-            return providers
+            providers_raw = (
+                dict(self.config.providers.items())
+                if "providers" in self.config
+                else {}
+            )
+        except KeyError:
+            console.print(
+                "[bold red]ERROR:[/] Missing [italic]providers[/] in the config"
+            )
+            sys.exit(1)
+        return {
+            name: Provider.create(name=name, **provider)
+            for name, provider in providers_raw.items()
+        }
 
-    @property
+    @cached_property
     def scenarios(self):
+        if "scenarios" not in self.config:
+            return {}
         try:
-            scenarios = getattr(self, "_scenarios")
-        except AttributeError:
-            scenarios = {}
-            if "scenarios" in self.config:
-                try:
-                    scenarios_raw = (
-                        {
-                            s: self.config.scenarios[s].as_dict()
-                            for s in list(self.config.scenarios)
-                        }
-                        if "scenarios" in self.config
-                        else {}
-                    )
-                except KeyError:
-                    console.print(
-                        "[bold red]ERROR:[/] Missing [italic]scenarios[/] in the config"
-                    )
-                    sys.exit(1)
-                for name, scenario in scenarios_raw.items():
-                    tasks = []
-                    for task in scenario["tasks"]:
-                        task["targets"] = TargetList(
+            scenarios_raw = self.config.scenarios.items()
+        except KeyError:
+            console.print(
+                "[bold red]ERROR:[/] Missing [italic]scenarios[/] in the config"
+            )
+            sys.exit(1)
+        scenarios = {}
+        for name, scenario in scenarios_raw:
+            tasks = [
+                Task.create(
+                    **{
+                        **task,
+                        "targets": TargetList(
                             self.providers["spot"], self.aliases, task["targets"]
-                        )
-                        tasks.append(Task(**task))
-                    scenarios.update(
-                        {
-                            name: Scenario(
-                                name=name,
-                                tasks=tasks,
-                                description=scenario["description"],
-                            )
-                        }
-                    )
-            setattr(self, "_scenarios", scenarios)
-        finally:
-            return scenarios
+                        ),
+                    }
+                )
+                for task in scenario["tasks"]
+            ]
+            scenarios[name] = Scenario(
+                name=name,
+                tasks=tasks,
+                description=scenario.get("description", ""),
+                fail_fast=scenario.get("fail_fast", False),
+                parallel=scenario.get("parallel", False),
+            )
+        return scenarios
 
-    @property
+    @cached_property
     def aliases(self):
         try:
-            aliases = getattr(self, "_aliases")
-        except AttributeError:
-            try:
-                aliases = (
-                    {
-                        k: Alias(name=k, targets=v)
-                        for k, v in self.config.aliases.as_dict().items()
-                    }
-                    if "aliases" in self.config
-                    else {}
-                )
-            except KeyError:
-                console.print(
-                    "[bold red]ERROR:[/] Missing [italic]aliases[/] in the config"
-                )
-                sys.exit(1)
-            setattr(self, "_aliases", aliases)
-        finally:
-            return aliases
+            return (
+                {
+                    k: Alias(name=k, targets=v)
+                    for k, v in self.config.aliases.as_dict().items()
+                }
+                if "aliases" in self.config
+                else {}
+            )
+        except KeyError:
+            console.print(
+                "[bold red]ERROR:[/] Missing [italic]aliases[/] in the config"
+            )
+            sys.exit(1)
 
 
 def load():
     # Load bootstrap configuration
     try:
-        bootstrap_provider = Provider(
-            name="bootstrap", kind="file", path=os.path.expanduser("~/.spot")
+        bootstrap_provider = Provider.create(
+            name="bootstrap", kind="file", path=CONFIG_DIR
         )
-        bootstrap_source = Source(provider=bootstrap_provider, path="config.yaml")
-        bootstrap_config_data = ConfigurationSet(bootstrap_source.read())
+        bootstrap_raw = bootstrap_provider.get("config.yaml")
+        bootstrap_config_data = ConfigurationSet(parse(bootstrap_raw))
         bootstrap_config = Config(bootstrap_config_data)
+        cache_path = os.path.join(
+            CACHE_DIR, f"config-{_cache_key(bootstrap_raw, bootstrap_config)}.json"
+        )
+        cached_config_data = _read_cache(cache_path)
+        if cached_config_data is not None:
+            return Config(ConfigurationSet(config_from_dict(cached_config_data)))
     except Exception:
         console.print("[bold red]ERROR:[/] Unable to load config")
         console.print_exception()
@@ -166,13 +162,61 @@ def load():
 
     # Load actual configuration
     try:
-        config_data = ConfigurationSet(
-            bootstrap_config_data,
-            *[source.read() for source in bootstrap_config.sources]
-        )
+        sources = bootstrap_config.sources
+        configs = []
+        if sources:
+            # Sources are fetched over the network, read them concurrently
+            with ThreadPoolExecutor(max_workers=min(8, len(sources))) as executor:
+                configs = list(executor.map(Source.read, sources))
+        config_data = ConfigurationSet(bootstrap_config_data, *configs)
         config = Config(config_data)
+        _write_cache(cache_path, config_data.as_dict())
         return config
     except Exception:
         console.print("[bold red]ERROR:[/] Unable to load config")
         console.print_exception()
         sys.exit(1)
+
+
+def _cache_key(bootstrap_raw: str, bootstrap_config: Config) -> str:
+    # Local sources are cheap to check, so their edits invalidate the cache
+    # right away; remote sources are only refreshed after CACHE_TTL
+    key = hashlib.sha256(bootstrap_raw.encode("utf-8"))
+    for source in bootstrap_config.sources:
+        if isinstance(source.provider, FileProvider):
+            try:
+                mtime = os.stat(
+                    os.path.join(source.provider.path, source.path)
+                ).st_mtime_ns
+            except OSError:
+                mtime = 0
+            key.update(
+                f"\0{source.provider.path}\0{source.path}\0{mtime}".encode("utf-8")
+            )
+    return key.hexdigest()
+
+
+def _read_cache(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        if time.time() - os.stat(path).st_mtime >= CACHE_TTL:
+            return None
+        with open(path, "r") as file:
+            return json.load(file)
+    except Exception:
+        return None
+
+
+def _write_cache(path: str, config_data: Dict[str, Any]) -> None:
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        for pattern in ("config-*.json", "config-*.pkl"):
+            for stale_path in glob.glob(os.path.join(CACHE_DIR, pattern)):
+                os.remove(stale_path)
+        # Merged config may contain credentials, keep it private to the user
+        path_tmp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(path_tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w") as file:
+            json.dump(config_data, file)
+        os.replace(path_tmp, path)
+    except Exception:
+        pass
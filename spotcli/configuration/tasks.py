@@ -1,29 +1,55 @@
+import atexit
+import os
 import sys
 import threading
 from abc import ABC, abstractmethod
-from collections import UserList
-from typing import Dict, List, Optional, Union
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import attr
-import rich.console
 
+from spotcli.log import console
 from spotcli.providers.spot import SpotProvider
 from spotcli.utils.elastigroup import Elastigroup, ElastigroupProcess
 
-console = rich.console.Console(highlight=False)
+# Without the GIL (PEP 703 builds, PYTHON_GIL=0) the Python-side work of the
+# workers runs in parallel too, so the default pool scales with the CPU count
+gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+default_workers = 32 if gil_enabled else max(32, (os.cpu_count() or 1) * 4)
 
+# Shared by all tasks, so that worker threads are reused across a scenario
+executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("SPOTCLI_MAX_WORKERS", default_workers)),
+    thread_name_prefix="spotcli",
+)
+atexit.register(executor.shutdown)
 
-class Alias(UserList):
+# (target name, exception raised while acting on it or None)
+Result = Tuple[str, Optional[Exception]]
+
+
+class Alias(list):
     def __init__(self, name: str, targets: List[str]):
+        super().__init__(targets)
         self.name = name
-        self.targets = targets
 
     @property
-    def data(self):
-        return self.targets
+    def targets(self) -> List[str]:
+        return self
 
 
-class TargetList(UserList):
+class TargetList:
     def __init__(
         self,
         spot: SpotProvider,
@@ -33,36 +59,89 @@ class TargetList(UserList):
         self.spot = spot
         self.aliases = aliases
         self.targets = targets
+        self._targets: Optional[List[Elastigroup]] = None
+        self._lock = threading.Lock()
 
     @property
     def data(self):
-        try:
-            targets = getattr(self, "_targets")
-        except AttributeError:
-
-            def reduce(
-                array: Union[List[str], Alias, str], result: List[str] = []
-            ) -> List[str]:
-                """Flatten a list with arbitrary dimensions."""
-                if isinstance(array, str):
-                    array = [array]
-                for item in array:
-                    if isinstance(item, str):
-                        if item in self.aliases:
-                            reduce(self.aliases[item], result)
-                        else:
-                            result.append(item)
-                    else:
-                        reduce(item, result)
-                return result
-
-            targets = Elastigroup.find(self.spot.client(), reduce(self.targets))
-            setattr(self, "_targets", targets)
-        finally:
-            return targets
-
-
-@attr.s(auto_attribs=True)
+        with self._lock:
+            return self._resolve()
+
+    def __iter__(self) -> Iterator[Elastigroup]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def __repr__(self) -> str:
+        return repr(self.data)
+
+    def _resolve(self):
+        if self._targets is None:
+            self._targets = Elastigroup.find(self.spot.client(), self.flatten())
+        return self._targets
+
+    def share(self, other: "TargetList") -> None:
+        """Reuse the resolved targets of another list with the same targets."""
+        targets = other.data
+        with self._lock:
+            self._targets = targets
+
+    def flatten(self) -> List[str]:
+        """Flatten targets with arbitrary dimensions, expanding aliases."""
+        stack: List[Any] = (
+            [self.targets]
+            if isinstance(self.targets, str)
+            else [*reversed(self.targets)]
+        )
+        expanded: Dict[str, List[Any]] = {}
+        expanding: Set[str] = set()
+        result: List[str] = []
+        while stack:
+            item = stack.pop()
+            if isinstance(item, _AliasEnd):
+                expanding.discard(item.name)
+            elif isinstance(item, str):
+                if item not in self.aliases:
+                    result.append(item)
+                    continue
+                if item in expanding:
+                    console.print(f"[bold red]ERROR:[/] Circular alias: {item}")
+                    sys.exit(1)
+                if item not in expanded:
+                    expanded[item] = list(self.aliases[item])
+                expanding.add(item)
+                stack.append(_AliasEnd(item))
+                stack.extend(reversed(expanded[item]))
+            else:
+                stack.extend(reversed(item))
+        return result
+
+
+class _AliasEnd(NamedTuple):
+    """Stack marker for the end of an alias expansion."""
+
+    name: str
+
+
+class Amount(NamedTuple):
+    """Instance amount, either absolute or a percentage of target capacity."""
+
+    value: int
+    percent: bool
+
+    @property
+    def label(self) -> str:
+        return f"{self.value}%" if self.percent else f"{self.value} instances"
+
+    def __str__(self) -> str:
+        return f"{self.value}%" if self.percent else str(self.value)
+
+
+@attr.s(auto_attribs=True, slots=True)
 class Task(ABC):
     kind: str
     targets: TargetList
@@ -77,206 +156,245 @@ class Task(ABC):
 
         return decorator
 
-    def __new__(cls, kind: str, *args, **kwargs) -> "Task":
-        if cls is not Task:
-            return super(Task, cls).__new__(cls, kind, *args, **kwargs)  # type: ignore
+    @classmethod
+    def create(cls, kind: str, *args, **kwargs) -> "Task":
         try:
             task = getattr(cls, "kinds", {})[kind]
-            return super(Task, cls).__new__(task)
         except KeyError:
             console.print(f"[bold red]ERROR:[/] Invalid action: {kind}")
             sys.exit(1)
+        return task(kind, *args, **kwargs)
 
     @abstractmethod
-    def run(self):
+    def run(self, fail_fast: bool = False) -> List[Result]:
         pass
 
+    def target_ids(self) -> Set[str]:
+        """Get IDs of Elastigroups the task acts on."""
+        return {target.id for target in self.targets}
+
+    @staticmethod
+    def collect(futures: List[Future], fail_fast: bool = False) -> List[Result]:
+        """Gather worker results, cancelling pending work on the first failure."""
+        results = []
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            result = future.result()
+            results.append(result)
+            if fail_fast and result[1] is not None:
+                for pending in futures:
+                    pending.cancel()
+        return results
+
+
+def _processes(names: List[Union[str, ElastigroupProcess]]) -> List[ElastigroupProcess]:
+    processes = []
+    for name in names:
+        if isinstance(name, ElastigroupProcess):
+            processes.append(name)
+            continue
+        try:
+            processes.append(ElastigroupProcess[name])
+        except KeyError:
+            console.print(f"[bold red]ERROR:[/] Invalid process: {name}")
+            sys.exit(1)
+    return processes
+
+
+def _amount(amount: Union[str, int, Amount]) -> Amount:
+    if isinstance(amount, Amount):
+        return amount
+    raw = str(amount).strip()
+    percent = raw.endswith("%")
+    try:
+        return Amount(int(raw[:-1] if percent else raw), percent)
+    except ValueError:
+        console.print(f"[bold red]ERROR:[/] Invalid amount: {amount}")
+        sys.exit(1)
+
+
+def _roll_work(target: Elastigroup, batch: Amount, grace: Union[str, int]) -> Result:
+    try:
+        target.roll(str(batch), grace)
+        console.print(
+            f"Started roll on [bold blue]{target.name}[/] with [bold cyan]"
+            f"{batch.label}[/] batch size"
+        )
+        return target.name, None
+    except Exception as exc:
+        console.print(
+            f"[bold red]ERROR:[/] Failed to roll [bold blue]{target.name}[/]: {exc}"
+        )
+        return target.name, exc
+
+
+def _scale_work(target: Elastigroup, direction: str, amount: Amount) -> Result:
+    try:
+        getattr(target, f"scale_{direction}")(str(amount))
+        console.print(
+            f"Scaled {direction} [bold blue]{target.name}[/] by [bold cyan]{amount.label}[/]"
+        )
+        return target.name, None
+    except Exception as exc:
+        console.print(
+            f"[bold red]ERROR:[/] Failed to scale {direction} [bold blue]{target.name}[/]: {exc}"
+        )
+        return target.name, exc
+
+
+def _process_work(
+    target: Elastigroup, action: str, processes: List[ElastigroupProcess]
+) -> Result:
+    names = ", ".join(process.name for process in processes)
+    try:
+        getattr(target, f"{action}_many")(processes)
+        console.print(
+            f"{action.capitalize()}ed [bold cyan]{names}[/] on [bold blue]{target.name}[/]"
+        )
+        return target.name, None
+    except Exception as exc:
+        console.print(
+            f"[bold red]ERROR:[/] Failed to {action} [bold cyan]{names}[/] on [bold blue]{target.name}[/]: {exc}"
+        )
+        return target.name, exc
+
 
 @Task.register("roll")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class RollTask(Task):
-    batch: Optional[Union[str, int]] = ""
+    batch: Amount = attr.ib(default="20%", converter=_amount)
     grace: Optional[Union[str, int]] = ""
 
-    def run(self):
-        def work(target, batch, grace, console):
-            try:
-                target.roll(batch, grace)
-                console.print(
-                    f"Started roll on [bold blue]{target.name}[/] with [bold cyan]"
-                    f"{self.batch if '%' in str(self.batch) else self.batch + ' instances'}[/] batch size"
-                )
-                return True
-            except Exception:
-                console.print(
-                    f"[bold red]ERROR:[/] Failed to roll [bold]{target.name}[/]"
-                )
-                console.print_exception()
-                return False
-
-        threads = []
-        for target in self.targets:
-            thread = threading.Thread(
-                None,
-                work,
-                kwargs=dict(
-                    target=target, batch=self.batch, grace=self.grace, console=console
-                ),
-            )
-            thread.start()
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
+    def run(self, fail_fast: bool = False):
+        futures = [
+            executor.submit(_roll_work, target, self.batch, self.grace)
+            for target in self.targets
+        ]
+        return self.collect(futures, fail_fast)
 
 
 @Task.register("upscale")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class UpscaleTask(Task):
-    amount: Union[int, str]
-
-    def run(self):
-        def work(target, amount, console):
-            try:
-                target.scale_up(amount)
-                console.print(
-                    f"Scaled up [bold blue]{target.name}[/] by [bold cyan]{amount if '%' in str(amount) else amount + ' instances'}[/]"
-                )
-                return True
-            except Exception:
-                console.print(
-                    f"[bold red]ERROR:[/] Failed to scale up [bold]{target.name}[/]"
-                )
-                console.print_exception()
-                return False
-
-        threads = []
-        for target in self.targets:
-            thread = threading.Thread(
-                None,
-                work,
-                kwargs=dict(target=target, amount=self.amount, console=console),
-            )
-            thread.start()
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
+    amount: Amount = attr.ib(converter=_amount)
+
+    def run(self, fail_fast: bool = False):
+        futures = [
+            executor.submit(_scale_work, target, "up", self.amount)
+            for target in self.targets
+        ]
+        return self.collect(futures, fail_fast)
 
 
 @Task.register("downscale")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class DownscaleTask(Task):
-    amount: Union[int, str]
-
-    def run(self):
-        def work(target, amount, console):
-            try:
-                target.scale_down(amount)
-                console.print(
-                    f"Scaled down [bold blue]{target.name}[/] by [bold cyan]{amount if '%' in str(amount) else amount + ' instances'}[/]"
-                )
-                return True
-            except Exception:
-                console.print(
-                    f"[bold red]ERROR:[/] Failed to scale down [bold blue]{target.name}[/]"
-                )
-                console.print_exception()
-                return False
-
-        threads = []
-        for target in self.targets:
-            thread = threading.Thread(
-                None,
-                work,
-                kwargs=dict(target=target, amount=self.amount, console=console),
-            )
-            thread.start()
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
+    amount: Amount = attr.ib(converter=_amount)
+
+    def run(self, fail_fast: bool = False):
+        futures = [
+            executor.submit(_scale_work, target, "down", self.amount)
+            for target in self.targets
+        ]
+        return self.collect(futures, fail_fast)
 
 
 @Task.register("suspend")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class SuspendTask(Task):
-    processes: List[str]
-
-    def run(self):
-        def work(target, process, console):
-            process = ElastigroupProcess[process]
-            try:
-                target.suspend(process)
-                console.print(
-                    f"Suspended [bold cyan]{process.name}[/] on [bold blue]{target.name}[/]"
-                )
-                return True
-            except Exception:
-                console.print(
-                    f"[bold red]ERROR:[/] Failed to suspend [bold cyan]{process.name}[/] on [bold blue]{target.name}[/]"
-                )
-                console.print_exception()
-                return False
-
-        threads = []
-        for target in self.targets:
-            for process in self.processes:
-                thread = threading.Thread(
-                    None,
-                    work,
-                    kwargs=dict(target=target, process=process, console=console),
-                )
-                thread.start()
-                threads.append(thread)
-
-        for thread in threads:
-            thread.join()
+    processes: List[ElastigroupProcess] = attr.ib(converter=_processes)
+
+    def run(self, fail_fast: bool = False):
+        # One worker per target, regular processes are suspended in one call
+        futures = [
+            executor.submit(_process_work, target, "suspend", self.processes)
+            for target in self.targets
+        ]
+        return self.collect(futures, fail_fast)
 
 
 @Task.register("unsuspend")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class UnsuspendTask(Task):
-    processes: List[str]
-
-    def run(self):
-        def work(target, process, console):
-            process = ElastigroupProcess[process]
-            try:
-                target.unsuspend(process)
-                console.print(
-                    f"Unsuspended [bold cyan]{process.name}[/] on [bold blue]{target.name}[/]"
-                )
-                return True
-            except Exception:
-                console.print(
-                    f"[bold red]ERROR:[/] Failed to unsuspend [bold cyan]{process.name}[/] on [bold blue]{target.name}[/]"
-                )
-                console.print_exception()
-                return False
-
-        threads = []
-        for target in self.targets:
-            for process in self.processes:
-                thread = threading.Thread(
-                    None,
-                    work,
-                    kwargs=dict(target=target, process=process, console=console),
-                )
-                thread.start()
-                threads.append(thread)
-
-        for thread in threads:
-            thread.join()
-
-
-@attr.s(auto_attribs=True)
+    processes: List[ElastigroupProcess] = attr.ib(converter=_processes)
+
+    def run(self, fail_fast: bool = False):
+        # One worker per target, regular processes are unsuspended in one call
+        futures = [
+            executor.submit(_process_work, target, "unsuspend", self.processes)
+            for target in self.targets
+        ]
+        return self.collect(futures, fail_fast)
+
+
+@attr.s(auto_attribs=True, slots=True)
 class Scenario:
     name: str
     tasks: List[Task]
     description: Optional[str] = ""
-
-    def run(self):
+    fail_fast: Optional[bool] = False
+    parallel: Optional[bool] = False
+    # Number of tasks the last run() executed, fail-fast may skip the rest
+    executed: int = attr.ib(default=0, init=False, eq=False)
+
+    def resolve(self):
+        """Resolve targets of all tasks concurrently, once per unique target set."""
+        unique: Dict[FrozenSet[str], List[TargetList]] = {}
+        for task in self.tasks:
+            key = frozenset(task.targets.flatten())
+            unique.setdefault(key, []).append(task.targets)
+
+        def work(target_lists):
+            first, *rest = target_lists
+            list(first)
+            for target_list in rest:
+                target_list.share(first)
+
+        list(executor.map(work, unique.values()))
+
+    def run(self, fail_fast: Optional[bool] = None) -> List[Result]:
+        fail_fast = self.fail_fast if fail_fast is None else fail_fast
+        self.resolve()
+        self.executed = 0
+        if self.parallel:
+            return self._run_parallel(fail_fast)
         results = []
         for task in self.tasks:
-            task.run()
+            task_results = task.run(fail_fast)
+            self.executed += 1
+            results.extend(task_results)
+            if fail_fast and any(exc is not None for _, exc in task_results):
+                break
+        return results
+
+    def _run_parallel(self, fail_fast: bool) -> List[Result]:
+        """Run tasks concurrently, keeping order between tasks with common targets."""
+        failed = threading.Event()
+        executed = []
+
+        def work(task, dependencies):
+            for dependency in dependencies:
+                dependency.result()
+            if failed.is_set():
+                return []
+            executed.append(task)
+            task_results = task.run(fail_fast)
+            if fail_fast and any(exc is not None for _, exc in task_results):
+                failed.set()
+            return task_results
+
+        # Tasks wait on their workers in the shared executor, so they get
+        # a pool of their own to avoid exhausting it
+        target_ids = [task.target_ids() for task in self.tasks]
+        futures: List[Future] = []
+        with ThreadPoolExecutor(
+            max_workers=len(self.tasks) or 1, thread_name_prefix="spotcli-task"
+        ) as tasks_executor:
+            for i, task in enumerate(self.tasks):
+                dependencies = [
+                    futures[j] for j in range(i) if target_ids[i] & target_ids[j]
+                ]
+                futures.append(tasks_executor.submit(work, task, dependencies))
+        self.executed = len(executed)
+        return [result for future in futures for result in future.result()]
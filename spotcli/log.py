@@ -0,0 +1,4 @@
+import rich.console
+
+# Shared by all modules, so that output from worker threads does not interleave
+console = rich.console.Console(highlight=False)
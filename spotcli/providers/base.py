@@ -2,12 +2,11 @@ import sys
 from abc import ABC, abstractmethod
 
 import attr
-import rich.console
 
-console = rich.console.Console(highlight=False)
+from spotcli.log import console
 
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class Provider(ABC):
     name: str
     kind: str = ""
@@ -22,15 +21,14 @@ class Provider(ABC):
 
         return decorator
 
-    def __new__(cls, name: str, kind: str, *args, **kwargs) -> "Provider":
-        if cls is not Provider:
-            return super(Provider, cls).__new__(cls, name, kind, *args, **kwargs)  # type: ignore
+    @classmethod
+    def create(cls, name: str, kind: str, *args, **kwargs) -> "Provider":
         try:
             provider = getattr(cls, "providers", {})[kind]
-            return super(Provider, cls).__new__(provider)
         except KeyError:
             console.print(f"[bold red]ERROR:[/] Invalid provider kind: {kind}")
             sys.exit(1)
+        return provider(name, kind, *args, **kwargs)
 
     @abstractmethod
     def client(self):
@@ -1,18 +1,20 @@
 import os
 import sys
-from typing import Optional
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
 import attr
 import consul as consul_client  # type: ignore
-import rich.console
 
+from spotcli.log import console
 from spotcli.providers import Provider
 
-console = rich.console.Console(highlight=False)
+KV_CACHE_TTL = int(os.environ.get("SPOTCLI_CONSUL_CACHE_TTL", 30))
 
 
 @Provider.register("consul")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class ConsulProvider(Provider):
     name: str
     kind: str
@@ -22,36 +24,54 @@ class ConsulProvider(Provider):
     datacenter: Optional[str] = ""
     token: Optional[str] = ""
 
+    _consul: Any = attr.ib(default=None, init=False, repr=False, eq=False)
+    _lock: threading.Lock = attr.ib(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
+    _kv_cache: Dict[str, Tuple[float, str]] = attr.ib(
+        factory=dict, init=False, repr=False, eq=False
+    )
+    _kv_prefix: str = attr.ib(default="", init=False, repr=False, eq=False)
+
+    def __attrs_post_init__(self):
+        base = self.path.strip("/")
+        self._kv_prefix = f"{base}/" if base else ""
+
     def client(self):
-        try:
-            consul = getattr(self, "_consul")
-        except AttributeError:
-            # Initialize Consul client
-            host, *port = self.server.split(":")
-            port = int(port[0]) if port else 8500
-            scheme = self.scheme or "http"
-            datacenter = self.datacenter or None
-            token = self.token or None
-            consul = consul_client.Consul(
-                host=host, port=port, scheme=scheme, dc=datacenter, token=token
-            )
-            setattr(self, "_consul", consul)
-        finally:
-            return consul
+        if self._consul is None:
+            with self._lock:
+                if self._consul is None:
+                    # Initialize Consul client
+                    host, *port = self.server.split(":")
+                    port = int(port[0]) if port else 8500
+                    scheme = self.scheme or "http"
+                    datacenter = self.datacenter or None
+                    token = self.token or None
+                    self._consul = consul_client.Consul(
+                        host=host, port=port, scheme=scheme, dc=datacenter, token=token
+                    )
+        return self._consul
 
     def get(self, path):
-        kv_path = os.path.join(self.path, path)
+        kv_path = self._kv_prefix + path.lstrip("/")
+        with self._lock:
+            cached = self._kv_cache.get(kv_path)
+        if cached and time.monotonic() - cached[0] < KV_CACHE_TTL:
+            return cached[1]
         consul = self.client()
         try:
-            kv_path = kv_path.lstrip("/")
             _, document = consul.kv.get(kv_path)
             content = document["Value"].decode("utf-8")
-            return content
         except (KeyError, TypeError):
             console.print(f"[bold red]ERROR:[/] Consul key not found: {kv_path}")
             sys.exit(1)
+        with self._lock:
+            self._kv_cache[kv_path] = (time.monotonic(), content)
+        return content
 
     def put(self, path, content):
-        kv_path = os.path.join(self.path, path)
+        kv_path = self._kv_prefix + path.lstrip("/")
         consul = self.client()
         consul.kv.set(kv_path, content)
+        with self._lock:
+            self._kv_cache.pop(kv_path, None)
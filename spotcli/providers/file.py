@@ -2,15 +2,13 @@ import os
 import sys
 
 import attr
-import rich.console
 
+from spotcli.log import console
 from spotcli.providers import Provider
 
-console = rich.console.Console(highlight=False)
-
 
 @Provider.register("file")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class FileProvider(Provider):
     name: str
     kind: str
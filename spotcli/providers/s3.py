@@ -1,19 +1,18 @@
 import os
 import sys
-from typing import Optional
+import threading
+from typing import Any, Optional
 
 import attr
 import boto3  # type: ignore
-import rich.console
 from botocore.exceptions import ClientError  # type: ignore
 
+from spotcli.log import console
 from spotcli.providers import Provider
 
-console = rich.console.Console(highlight=False)
-
 
 @Provider.register("s3")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class S3Provider(Provider):
     name: str
     kind: str
@@ -22,23 +21,26 @@ class S3Provider(Provider):
     access_key_id: Optional[str] = ""
     secret_access_key: Optional[str] = ""
 
+    _s3: Any = attr.ib(default=None, init=False, repr=False, eq=False)
+    _lock: threading.Lock = attr.ib(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
+
     def client(self):
-        try:
-            s3 = getattr(self, "_s3")
-        except AttributeError:
-            # Initialize S3 client
-            credentials = (
-                {
-                    "aws_access_key_id": self.access_key_id,
-                    "aws_secret_access_key": self.secret_access_key,
-                }
-                if self.access_key_id and self.secret_access_key
-                else {}
-            )
-            s3 = boto3.resource("s3", **credentials)
-            setattr(self, "_s3", s3)
-        finally:
-            return s3
+        if self._s3 is None:
+            with self._lock:
+                if self._s3 is None:
+                    # Initialize S3 client
+                    credentials = (
+                        {
+                            "aws_access_key_id": self.access_key_id,
+                            "aws_secret_access_key": self.secret_access_key,
+                        }
+                        if self.access_key_id and self.secret_access_key
+                        else {}
+                    )
+                    self._s3 = boto3.resource("s3", **credentials)
+        return self._s3
 
     def get(self, path):
         object_path = os.path.join(self.path, path).lstrip("/")
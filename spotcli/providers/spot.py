@@ -1,27 +1,101 @@
+import os
+import threading
+from typing import Optional
+
 import attr
+import requests
 import spotinst_sdk  # type: ignore
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from spotcli.providers import Provider
 
+POOL_SIZE = int(os.environ.get("SPOTCLI_MAX_WORKERS", 32))
+
+session_installed = False
+session_lock = threading.Lock()
+
+
+class _SessionRequests:
+    """Stand-in for the `requests` module that sends calls through a session.
+
+    Only the request functions are overridden; any other attribute (`codes`,
+    exceptions, ...) is looked up on the real module.
+    """
+
+    def __init__(self, session: requests.Session):
+        self.get = session.get
+        self.post = session.post
+        self.put = session.put
+        self.delete = session.delete
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def _retry() -> Retry:
+    # Only GETs are retried: scale up/down are non-idempotent PUTs, and
+    # resending one after the server has applied it would scale twice.
+    options = dict(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 502, 503, 504),
+        raise_on_status=False,
+    )
+    try:
+        return Retry(allowed_methods=frozenset({"GET"}), **options)
+    except TypeError:
+        # urllib3 < 1.26
+        return Retry(method_whitelist=frozenset({"GET"}), **options)
+
+
+def _install_session() -> None:
+    """Route spotinst_sdk requests through a shared keep-alive session.
+
+    The SDK calls module-level `requests.get()` and friends, so every API call
+    opens a new connection. Swap its `requests` reference for a pooled
+    session that also retries throttled and unavailable GETs. SDK versions
+    that do not use the `requests` module this way are left untouched.
+    """
+    global session_installed
+    with session_lock:
+        if session_installed:
+            return
+        session_installed = True
+        if getattr(spotinst_sdk, "requests", None) is not requests:
+            return
+        adapter = HTTPAdapter(
+            pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE * 2, max_retries=_retry()
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        spotinst_sdk.requests = _SessionRequests(session)
+
 
 @Provider.register("spot")
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class SpotProvider(Provider):
     name: str
     kind: str
     account: str
     token: str
+    _spot: Optional[spotinst_sdk.SpotinstClient] = attr.ib(
+        default=None, init=False, repr=False, eq=False
+    )
+    _lock: threading.Lock = attr.ib(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
 
     def client(self) -> spotinst_sdk.SpotinstClient:
-        try:
-            spot = getattr(self, "_spot")
-        except AttributeError:
-            spot = spotinst_sdk.SpotinstClient(
-                account_id=self.account, auth_token=self.token
-            )
-            setattr(self, "_spot", spot)
-        finally:
-            return spot
+        if self._spot is None:
+            with self._lock:
+                if self._spot is None:
+                    _install_session()
+                    self._spot = spotinst_sdk.SpotinstClient(
+                        account_id=self.account, auth_token=self.token
+                    )
+        return self._spot
 
     def get(self):
         raise NotImplementedError
@@ -0,0 +1,28 @@
+"""Compatibility module.
+
+This module provides fallbacks for standard library features missing on older Python versions.
+"""
+
+try:
+    from functools import cached_property
+except ImportError:  # Python < 3.8
+
+    class cached_property:  # type: ignore
+        """Compute a property once per instance and store the result in its `__dict__`."""
+
+        def __init__(self, func):
+            self.func = func
+            self.attrname = None
+            self.__doc__ = func.__doc__
+
+        def __set_name__(self, owner, name):
+            self.attrname = name
+
+        def __get__(self, instance, owner=None):
+            if instance is None:
+                return self
+            value = instance.__dict__[self.attrname] = self.func(instance)
+            return value
+
+
+__all__ = ["cached_property"]
@@ -4,7 +4,11 @@ This module accomodates an interface for Spot Elastigroup.
 """
 
 import enum
-from typing import Any, Dict, List, Union
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import attr
 import durations  # type: ignore
@@ -12,8 +16,14 @@ import spotinst_sdk  # type: ignore
 
 import spotcli.utils
 
+CACHE_TTL = int(os.environ.get("SPOTCLI_GROUP_CACHE_TTL", 60))
 
-@attr.s(auto_attribs=True)
+# Groups by name per Spot client, with their expiry time
+_groups: Dict[spotinst_sdk.SpotinstClient, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+_groups_lock = threading.Lock()
+
+
+@attr.s(auto_attribs=True, slots=True)
 class Elastigroup:
     """Interface for a Spot Elastigroup.
 
@@ -30,6 +40,13 @@ class Elastigroup:
 
     spot: spotinst_sdk.SpotinstClient
     id: str
+    _group_data: Optional[Dict[str, Any]] = attr.ib(
+        default=None, init=False, repr=False, eq=False
+    )
+    _group_expires: float = attr.ib(default=0.0, init=False, repr=False, eq=False)
+    _lock: threading.Lock = attr.ib(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
 
     @classmethod
     def find(
@@ -47,27 +64,44 @@ class Elastigroup:
             List[Elastigroup]: Found Elastigroups.
         """
 
-        try:
-            groups = getattr(cls, "_elastigroups")
-        except AttributeError:
-            groups = {group["name"]: group["id"] for group in spot.get_elastigroups()}
-            setattr(cls, "_elastigroups", groups)
+        # Target lists may be resolved concurrently, list groups only once
+        with _groups_lock:
+            expires, groups = _groups.get(spot, (0.0, {}))
+            if time.monotonic() >= expires:
+                expires = time.monotonic() + CACHE_TTL
+                # Names and IDs are looked up again and again, keep one copy
+                groups = {
+                    sys.intern(group["name"]): {**group, "id": sys.intern(group["id"])}
+                    for group in spot.get_elastigroups()
+                }
+                _groups[spot] = (expires, groups)
 
         if isinstance(query, str):
             query = [query]
 
         matches_keys = spotcli.utils.filter(groups.keys(), query)
-        matches = [cls(spot, groups[key]) for key in matches_keys]
+        matches = []
+        for key in matches_keys:
+            # The listing carries full group details, no need to fetch them again
+            match = cls(spot, groups[key]["id"])
+            match._group_data, match._group_expires = groups[key], expires
+            matches.append(match)
         return matches
 
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Forget cached Elastigroup listings, so the next `find` lists groups again."""
+        with _groups_lock:
+            _groups.clear()
+
     @property
     def _group(self) -> Dict[str, Any]:
-        try:
-            group_data = getattr(self, "_group_data")
-        except AttributeError:
-            group_data = self.spot.get_elastigroup(self.id)
-            setattr(self, "_group_data", group_data)
-        return group_data
+        # Concurrent readers of the same group share a single API call
+        with self._lock:
+            if self._group_data is None or time.monotonic() >= self._group_expires:
+                self._group_data = self.spot.get_elastigroup(self.id)
+                self._group_expires = time.monotonic() + CACHE_TTL
+            return self._group_data
 
     @property
     def processes(self) -> Dict[str, str]:
@@ -84,46 +118,35 @@ class Elastigroup:
         """
         process_suspensions = self.spot.list_suspended_process(self.id)
         policy_suspensions = self.spot.list_suspended_scaling_policies(self.id)
-        policies = dict()
-        policies_raw = {
-            "down": self._group["scaling"].get("down") or [],
-            "up": self._group["scaling"].get("up") or [],
+        scaling = self._group["scaling"]
+        policies = {
+            process: [
+                policy["policy_name"]
+                for policy in scaling.get(process.name.rsplit("_", 1)[-1].lower()) or []
+            ]
+            for process in _AUTOSCALE_PROCESSES
         }
-        policies[ElastigroupProcess.AUTO_SCALE_DOWN] = [
-            policy["policy_name"] for policy in policies_raw["down"]
-        ]
-        policies[ElastigroupProcess.AUTO_SCALE_UP] = [
-            policy["policy_name"] for policy in policies_raw["up"]
-        ]
         suspended_processes = (
-            process_suspensions[0]["processes"] if process_suspensions else []
+            set(process_suspensions[0]["processes"]) if process_suspensions else set()
         )
         suspended_policies = (
-            [
+            {
                 suspension["policy_name"]
                 for suspension in policy_suspensions[0]["scale_policy_suspensions"]
-            ]
+            }
             if policy_suspensions
-            else []
+            else set()
         )
-        processes = dict()
-        for process in ElastigroupProcess:
-            if process in [
-                ElastigroupProcess.AUTO_SCALE_DOWN,
-                ElastigroupProcess.AUTO_SCALE_UP,
-            ]:
-                processes[process.name] = (
-                    "suspended"
-                    if any(
-                        [policy in suspended_policies for policy in policies[process]]
-                    )
-                    else "active"
-                )
-                continue
-            processes[process.name] = (
-                "suspended" if process.name in suspended_processes else "active"
+        return {
+            process.name: "suspended"
+            if (
+                any(policy in suspended_policies for policy in policies[process])
+                if process in _AUTOSCALE_PROCESSES
+                else process.name in suspended_processes
             )
-        return processes
+            else "active"
+            for process in ElastigroupProcess
+        }
 
     @property
     def capacity(self) -> Dict[str, int]:
@@ -193,10 +216,11 @@ class Elastigroup:
             grace (str, optional): Grace period. Default is 5 minutes.
 
         """
-        batch_percentage = int(
-            batch.strip("%")
-            if "%" in batch
-            else int(batch) / self.capacity["target"] * 100
+        batch = str(batch).strip()
+        batch_percentage = (
+            int(batch[:-1])
+            if batch.endswith("%")
+            else int(int(batch) / self._group["capacity"]["target"] * 100)
         )
         grace_seconds = int(durations.Duration(grace).to_seconds())
         return self.spot.roll_group(
@@ -215,23 +239,19 @@ class Elastigroup:
             process (ElastigroupProcess): Process to suspend.
 
         """
-        if not isinstance(process, ElastigroupProcess):
-            process = ElastigroupProcess[process]
-        if process in [
-            ElastigroupProcess.AUTO_SCALE_DOWN,
-            ElastigroupProcess.AUTO_SCALE_UP,
-        ]:
+        process = _as_process(process)
+        if process in _AUTOSCALE_PROCESSES:
             scaling_policy_kind = process.name.rsplit("_", 1)[-1].lower()
             scaling_policies = [
                 policy["policy_name"]
                 for policy in self._group["scaling"].get(scaling_policy_kind, [])
             ]
-            try:
-                for policy in scaling_policies:
+            for policy in scaling_policies:
+                try:
                     self.spot.suspend_scaling_policies(self.id, policy)
-            except spotinst_sdk.SpotinstClientException as e:
-                if "is already suspended" not in str(e):
-                    raise e
+                except spotinst_sdk.SpotinstClientException as e:
+                    if "is already suspended" not in str(e):
+                        raise e
             return
         self.spot.suspend_process(self.id, [process.name], None)
 
@@ -244,12 +264,8 @@ class Elastigroup:
             process (ElastigroupProcess): Process to unsuspend.
 
         """
-        if not isinstance(process, ElastigroupProcess):
-            process = ElastigroupProcess[process]
-        if process in [
-            ElastigroupProcess.AUTO_SCALE_DOWN,
-            ElastigroupProcess.AUTO_SCALE_UP,
-        ]:
+        process = _as_process(process)
+        if process in _AUTOSCALE_PROCESSES:
             scaling_policy_kind = process.name.rsplit("_", 1)[-1].lower()
             scaling_policies = [
                 policy["policy_name"]
@@ -260,6 +276,48 @@ class Elastigroup:
             return
         self.spot.remove_suspended_process(self.id, [process.name])
 
+    def suspend_many(self, processes: List[Union[str, "ElastigroupProcess"]]) -> None:
+        """Suspend several processes.
+
+        Suspends all regular processes with a single API call, auto-scaling policies
+        are suspended one by one.
+
+        Args:
+            processes (list of ElastigroupProcess): Processes to suspend.
+
+        """
+        policies, regular = _partition(processes)
+        for process in policies:
+            self.suspend(process)
+        if regular:
+            self.spot.suspend_process(
+                self.id, [process.name for process in regular], None
+            )
+
+    def unsuspend_many(self, processes: List[Union[str, "ElastigroupProcess"]]) -> None:
+        """Unsuspend several processes.
+
+        Unsuspends all regular processes with a single API call, auto-scaling policies
+        are unsuspended one by one.
+
+        Args:
+            processes (list of ElastigroupProcess): Processes to unsuspend.
+
+        """
+        policies, regular = _partition(processes)
+        for process in policies:
+            self.unsuspend(process)
+        if regular:
+            self.spot.remove_suspended_process(
+                self.id, [process.name for process in regular]
+            )
+
+    def _instances(self, amount: Union[str, int]) -> int:
+        amount = str(amount).strip()
+        if amount.endswith("%"):
+            return int(int(amount[:-1]) / 100 * self._group["capacity"]["target"])
+        return int(amount)
+
     def scale_up(self, amount: Union[str, int]) -> None:
         """Add instances to Elastigroup.
 
@@ -269,11 +327,7 @@ class Elastigroup:
             amount (int or str): Amount of instances to add, number or percentage from target capacity.
 
         """
-        amount = (
-            int(int(str(amount).strip("%")) / 100 * self.capacity["target"])
-            if "%" in str(amount)
-            else int(amount)
-        )
+        amount = self._instances(amount)
         if amount == 0:
             return
         self.spot.scale_elastigroup_up(self.id, amount)
@@ -287,11 +341,7 @@ class Elastigroup:
             amount (int or str): Amount of instances to remove, number or percentage from target capacity.
 
         """
-        amount = (
-            int(int(str(amount).strip("%")) / 100 * self.capacity["target"])
-            if "%" in str(amount)
-            else int(amount)
-        )
+        amount = self._instances(amount)
         if amount == 0:
             return
         self.spot.scale_elastigroup_down(self.id, amount)
@@ -313,3 +363,31 @@ class ElastigroupProcess(enum.Enum):
     SCHEDULING = enum.auto()
     AUTO_SCALE_DOWN = enum.auto()
     AUTO_SCALE_UP = enum.auto()
+
+
+_AUTOSCALE_PROCESSES = frozenset(
+    {ElastigroupProcess.AUTO_SCALE_DOWN, ElastigroupProcess.AUTO_SCALE_UP}
+)
+
+
+def _as_process(process: Union[str, int, ElastigroupProcess]) -> ElastigroupProcess:
+    """Get a process by member, name or value."""
+    if isinstance(process, ElastigroupProcess):
+        return process
+    if isinstance(process, str):
+        return ElastigroupProcess[process]
+    return ElastigroupProcess(process)
+
+
+def _partition(
+    processes: List[Union[str, int, ElastigroupProcess]]
+) -> Tuple[List[ElastigroupProcess], List[ElastigroupProcess]]:
+    """Split processes into auto-scaling policies and regular processes."""
+    policies, regular = [], []
+    for process in processes:
+        process = _as_process(process)
+        if process in _AUTOSCALE_PROCESSES:
+            policies.append(process)
+        else:
+            regular.append(process)
+    return policies, regular
@@ -1,31 +1,56 @@
+import functools
 import re
-from typing import List, Set, Union
+from typing import Iterable, List, Optional, Pattern, Set, Tuple, Union
 
 
-def filter(items: List[str], query: Union[str, List[str]]) -> Set[str]:
+def filter(items: Iterable[str], query: Union[str, List[str]]) -> Set[str]:
     """Filter items in list.
 
     Filters items in list using full match, substring match and regex match.
+    When possible, all filter expressions are combined into one regular
+    expression, so that each item is scanned only once.
 
     Args:
-        items (List[str]): Input list.
+        items (Iterable[str]): Input list.
         query (Union[str, List[str]]): Filter expression.
 
     Returns:
         Set[str]: Filtered items.
     """
 
-    matches: Set[str] = set()
     if isinstance(query, str):
         query = [query]
-    for query_item in query:
-        # Full match
-        matches = matches.union({item for item in items if query_item == item})
-
-        # Substring match
-        matches = matches.union({item for item in items if query_item in item})
-
-        # Regular expression match
-        regex = re.compile(query_item, re.IGNORECASE | re.ASCII)
-        matches = matches.union({item for item in items if regex.search(item)})
-    return matches
+    query = tuple(query)
+    regex = _compile_query(query)
+    if regex is not None:
+        return {item for item in items if regex.search(item)}
+    patterns = [
+        (query_item, re.compile(query_item, re.IGNORECASE | re.ASCII))
+        for query_item in query
+    ]
+    return {
+        item
+        for item in items
+        if any(
+            query_item in item or regex.search(item) for query_item, regex in patterns
+        )
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_query(query: Tuple[str, ...]) -> Optional[Pattern]:
+    # Group numbers shift once expressions are joined, so a backreference
+    # would silently point at another expression's group. Expressions with
+    # groups (and global flags, which fail to compile mid-pattern) are
+    # matched one by one instead.
+    for q in query:
+        if re.compile(q, re.IGNORECASE | re.ASCII).groups:
+            return None
+    # Case-sensitive literal alternative covers full and substring matches
+    try:
+        return re.compile(
+            "|".join(f"(?-i:{re.escape(q)})|(?:{q})" for q in query),
+            re.IGNORECASE | re.ASCII,
+        )
+    except re.error:
+        return None
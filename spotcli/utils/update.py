@@ -0,0 +1,171 @@
+"""Version banner and update check shared by the CLI commands."""
+
+import functools
+import json
+import os
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import click
+
+import spotcli
+
+if TYPE_CHECKING:
+    import requests
+    import rich.console
+
+UPDATE_URL = "https://api.github.com/repos/zerodayyy/spotcli/releases/latest"
+UPDATE_COMMAND = 'bash -c "$(curl -fsSL https://raw.githubusercontent.com/zerodayyy/spotcli/main/install.sh)"'
+UPDATE_CACHE = os.path.join(click.get_app_dir("spotcli"), "update_check.json")
+UPDATE_CACHE_TTL = int(os.environ.get("SPOTCLI_UPDATE_CHECK_TTL", 21600))
+
+update_result: "queue.Queue[str]" = queue.Queue(maxsize=1)
+traceback_installed = False
+
+
+def _console() -> "rich.console.Console":
+    from spotcli.log import console
+
+    return console
+
+
+def _install_traceback() -> None:
+    global traceback_installed
+    if not traceback_installed:
+        import rich.traceback
+
+        rich.traceback.install(console=_console())
+        traceback_installed = True
+
+
+def print_prologue() -> None:
+    _install_traceback()
+    if _quiet():
+        return
+    _console().print(f"[bold]SpotCLI version {spotcli.__version__}")
+
+
+def _quiet() -> bool:
+    ctx = click.get_current_context(silent=True)
+    return bool(ctx and ctx.obj and ctx.obj.get("quiet"))
+
+
+def print_update_notice() -> None:
+    if _quiet():
+        return
+    new_version = get_update_result(timeout=0)
+    if new_version:
+        _console().print(
+            f"\n[green]New version [bold]{new_version}[/] is available\n\n"
+            f"You can update SpotCLI by running:\n[bold]{UPDATE_COMMAND}[/]\n"
+        )
+
+
+def get_update_result(timeout: Optional[float] = None) -> str:
+    try:
+        return update_result.get(timeout=timeout)
+    except queue.Empty:
+        return ""
+
+
+def start_update_check() -> None:
+    """Look for a newer release in the background."""
+    threading.Thread(target=_update_probe, daemon=True).start()
+
+
+def _update_probe() -> None:
+    update_result.put(updates_available())
+
+
+@functools.lru_cache(maxsize=1)
+def updates_available() -> str:
+    url = UPDATE_URL
+    update = ""
+    try:
+        current_version = spotcli.__version__
+        cache = _read_update_cache(url)
+        if (
+            not cache
+            or time.time() - os.stat(UPDATE_CACHE).st_mtime >= UPDATE_CACHE_TTL
+        ):
+            # Refresh in the background, the result is picked up by the next run
+            threading.Thread(
+                target=_refresh_update_cache, args=(url, cache), daemon=True
+            ).start()
+        upstream_version = cache.get("upstream_version", current_version)
+        if _parse_version(upstream_version) > _parse_version(current_version):
+            update = upstream_version
+    except (OSError, ValueError, KeyError):
+        pass
+    return update
+
+
+def _refresh_update_cache(url: str, cache: Dict[str, Any]) -> None:
+    import requests
+
+    current_version = spotcli.__version__
+    etag = cache.get("etag", "")
+    headers = {"If-None-Match": etag} if etag else {}
+    try:
+        response = _session().get(url, headers=headers, timeout=1)
+        # Rate limits and server errors carry no release, keep the stale entry
+        response.raise_for_status()
+        if response.status_code == 304:
+            upstream_version = cache["upstream_version"]
+        else:
+            upstream_version = response.json().get("name", current_version).lstrip("v")
+            etag = response.headers.get("ETag", "")
+    except (requests.RequestException, ValueError):
+        # Reuse the stale entry and refresh it, so that repeated failures
+        # don't hit the API on every invocation
+        upstream_version = cache.get("upstream_version", current_version)
+    _write_update_cache(url, upstream_version, etag)
+
+
+@functools.lru_cache(maxsize=1)
+def _session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    session.headers.update(
+        {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": f"spotcli/{spotcli.__version__}",
+        }
+    )
+    return session
+
+
+def _parse_version(version: str) -> Tuple[int, ...]:
+    release = version.split("-")[0].split("+")[0]
+    return tuple(int(x) if x.isdigit() else 0 for x in release.split(".")[:3])
+
+
+def _read_update_cache(url: str) -> Dict[str, Any]:
+    try:
+        with open(UPDATE_CACHE, "r") as file:
+            cache = json.load(file)
+        return cache if cache.get("url") == url else {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _write_update_cache(url: str, upstream_version: str, etag: str = "") -> None:
+    cache = {
+        "url": url,
+        "timestamp": time.time(),
+        "upstream_version": upstream_version,
+        "etag": etag,
+    }
+    try:
+        os.makedirs(os.path.dirname(UPDATE_CACHE), exist_ok=True)
+        cache_tmp = f"{UPDATE_CACHE}.{os.getpid()}.tmp"
+        with open(cache_tmp, "w") as file:
+            json.dump(cache, file)
+        os.replace(cache_tmp, UPDATE_CACHE)
+    except OSError:
+        pass
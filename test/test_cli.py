@@ -0,0 +1,56 @@
+import unittest.mock
+
+import click.testing
+import pytest
+
+from spotcli import _cli_impl
+from spotcli.cli import main
+from spotcli.utils import update
+
+
+@pytest.mark.unit
+class CliTests:
+    def test_exits_with_failures(self, capsys):
+        results = [("a", None), ("b", RuntimeError("boom"))]
+        with pytest.raises(SystemExit) as exit:
+            _cli_impl._exit_on_failures(results)
+        assert exit.value.code == 1
+
+    def test_does_not_exit_without_failures(self):
+        _cli_impl._exit_on_failures([("a", None), ("b", None)])
+
+    def test_help_does_not_import_commands(self):
+        with unittest.mock.patch("importlib.import_module") as fake_import:
+            result = click.testing.CliRunner().invoke(main, ["--help"])
+        assert result.exit_code == 0
+        assert "Roll an elastigroup." in result.output
+        fake_import.assert_not_called()
+
+    def test_update_notice_reads_shared_result(self, capsys):
+        update.update_result.put("9.9.9")
+        update.print_update_notice()
+        assert "New version 9.9.9 is available" in capsys.readouterr().out
+
+    def test_update_check_ignores_missing_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(update, "UPDATE_CACHE", str(tmp_path / "missing.json"))
+        monkeypatch.setattr(update, "_refresh_update_cache", lambda *args: None)
+        update.updates_available.cache_clear()
+        assert update.updates_available() == ""
+        update.updates_available.cache_clear()
+
+    @pytest.mark.parametrize(
+        "result",
+        [
+            (None, 0, "Task run complete!"),
+            (RuntimeError("boom"), 1, "Task run finished with errors."),
+        ],
+    )
+    def test_action_summary_matches_exit_status(self, result):
+        task = unittest.mock.MagicMock(kind="roll", targets=[])
+        task.run.return_value = [("a", result[0])]
+        with unittest.mock.patch("spotcli.configuration.load"), unittest.mock.patch(
+            "spotcli._cli_impl.TargetList"
+        ), unittest.mock.patch.object(_cli_impl.Task, "create", return_value=task):
+            output = click.testing.CliRunner().invoke(main, ["-q", "roll", "web", "-y"])
+        assert output.exit_code == result[1]
+        assert result[2] in output.output
@@ -0,0 +1,100 @@
+import json
+import os
+import unittest.mock
+
+import pytest
+
+import spotcli.configuration.configuration as configuration
+
+BOOTSTRAP = """
+version: 1
+providers:
+  local:
+    kind: file
+    path: {path}
+sources:
+  - provider: local
+    path: source.yaml
+"""
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(configuration, "CONFIG_DIR", str(tmp_path))
+    monkeypatch.setattr(configuration, "CACHE_DIR", str(tmp_path / ".cache"))
+    (tmp_path / "config.yaml").write_text(BOOTSTRAP.format(path=tmp_path))
+    (tmp_path / "source.yaml").write_text("aliases:\n  web: [web-1, web-2]\n")
+    return tmp_path
+
+
+@pytest.mark.unit
+class ConfigurationTests:
+    def test_loads_and_merges_sources(self, config_dir):
+        config = configuration.load()
+        assert config.aliases["web"] == ["web-1", "web-2"]
+
+    def test_sources_are_optional(self, config_dir):
+        bootstrap = BOOTSTRAP.format(path=config_dir).split("sources:")[0]
+        bootstrap += "aliases:\n  api: [api-1]\n"
+        (config_dir / "config.yaml").write_text(bootstrap)
+        config = configuration.load()
+        assert config.sources == []
+        assert config.aliases["api"] == ["api-1"]
+
+    def test_scenario_description_is_optional(self, config_dir):
+        (config_dir / "source.yaml").write_text(
+            "providers:\n"
+            "  spot: {kind: spot, account: act-12345678, token: deadbeef}\n"
+            "scenarios:\n"
+            "  restart:\n"
+            "    tasks:\n"
+            "      - {kind: roll, targets: [web]}\n"
+        )
+        config = configuration.load()
+        assert config.scenarios["restart"].description == ""
+
+    def test_reuses_cached_config(self, config_dir):
+        configuration.load()
+        with unittest.mock.patch.object(configuration.Source, "read") as fake_read:
+            config = configuration.load()
+        fake_read.assert_not_called()
+        assert config.aliases["web"] == ["web-1", "web-2"]
+
+    def test_cache_is_private(self, config_dir):
+        configuration.load()
+        (cache_file,) = (config_dir / ".cache").iterdir()
+        assert cache_file.stat().st_mode & 0o777 == 0o600
+
+    def test_bootstrap_change_invalidates_cache(self, config_dir):
+        configuration.load()
+        (config_dir / "other.yaml").write_text("aliases:\n  api: [api-1]\n")
+        bootstrap = BOOTSTRAP.format(path=config_dir).replace(
+            "source.yaml", "other.yaml"
+        )
+        (config_dir / "config.yaml").write_text(bootstrap)
+        config = configuration.load()
+        assert "api" in config.aliases
+        assert len(os.listdir(config_dir / ".cache")) == 1
+
+    def test_cache_is_json(self, config_dir):
+        configuration.load()
+        (cache_file,) = (config_dir / ".cache").iterdir()
+        cached = json.loads(cache_file.read_text())
+        assert cached["aliases.web"] == ["web-1", "web-2"]
+
+    def test_local_source_change_invalidates_cache(self, config_dir):
+        configuration.load()
+        source = config_dir / "source.yaml"
+        source.write_text("aliases:\n  web: [web-3]\n")
+        mtime = source.stat().st_mtime_ns + 1_000_000_000
+        os.utime(source, ns=(mtime, mtime))
+        assert configuration.load().aliases["web"] == ["web-3"]
+
+    def test_expired_cache_is_ignored(self, config_dir, monkeypatch):
+        configuration.load()
+        monkeypatch.setattr(configuration, "CACHE_TTL", 0)
+        with unittest.mock.patch.object(
+            configuration.Source, "read", return_value=configuration.parse("")
+        ) as fake_read:
+            configuration.load()
+        fake_read.assert_called_once()
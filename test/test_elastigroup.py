@@ -3,7 +3,14 @@ import unittest.mock
 import pytest
 import spotinst_sdk
 
-from spotcli.elastigroup import Elastigroup, ElastigroupProcess
+from spotcli.utils.elastigroup import Elastigroup, ElastigroupProcess
+
+
+@pytest.fixture(autouse=True)
+def clear_elastigroup_cache():
+    Elastigroup.invalidate_cache()
+    yield
+    Elastigroup.invalidate_cache()
 
 
 @pytest.fixture(scope="function")
@@ -64,8 +71,7 @@ class ElastigroupTests:
             ("is", ["sig-00000001", "sig-00000002", "sig-00000005"]),
         ],
     )
-    @unittest.mock.patch("spotcli.elastigroup.Elastigroup", autospec=True)
-    def test_finds_elastigroups(_, ElastigroupMock, query):
+    def test_finds_elastigroups(_, query):
         mock_elastigroup_list = [
             {
                 "id": "sig-00000001",
@@ -99,10 +105,37 @@ class ElastigroupTests:
             return_value=mock_elastigroup_list
         )
         groups = Elastigroup.find(spotinst_client, query[0])
-        for id in query[1]:
-            ElastigroupMock.assert_any_call(spotinst_client, id)
-        assert groups == [ElastigroupMock(spotinst_client, id) for id in query[1]]
-        ElastigroupMock.reset_mock(return_value=True)
+        assert sorted(group.id for group in groups) == query[1]
+        assert all(group.spot is spotinst_client for group in groups)
+
+    def test_find_caches_elastigroup_list(_, arrange_elastigroup):
+        spotinst_client, _ = arrange_elastigroup
+        spotinst_client.get_elastigroups = unittest.mock.MagicMock(
+            return_value=[{"id": "sig-00000001", "name": "test-elastigroup"}]
+        )
+        first = Elastigroup.find(spotinst_client, "test")
+        second = Elastigroup.find(spotinst_client, ["test-elastigroup"])
+        spotinst_client.get_elastigroups.assert_called_once_with()
+        assert first == second
+        Elastigroup.invalidate_cache()
+        Elastigroup.find(spotinst_client, "test")
+        assert spotinst_client.get_elastigroups.call_count == 2
+
+    def test_find_reuses_listed_group_details(_, arrange_elastigroup):
+        spotinst_client, _ = arrange_elastigroup
+        spotinst_client.get_elastigroups = unittest.mock.MagicMock(
+            return_value=[
+                {
+                    "id": "sig-00000001",
+                    "name": "test-elastigroup",
+                    "capacity": {"minimum": 0, "maximum": 10, "target": 5},
+                }
+            ]
+        )
+        (group,) = Elastigroup.find(spotinst_client, "test")
+        assert group.name == "test-elastigroup"
+        assert group.capacity == {"minimum": 0, "maximum": 10, "target": 5}
+        spotinst_client.get_elastigroup.assert_not_called()
 
     @pytest.mark.parametrize("batch_size", [20, "20", "20%"])
     @unittest.mock.patch("spotinst_sdk.aws_elastigroup.Roll", autospec=True)
@@ -122,9 +155,13 @@ class ElastigroupTests:
     def test_elastigroup_suspend_scaling_policy(_, arrange_elastigroup):
         spotinst_client, elastigroup = arrange_elastigroup
         elastigroup.suspend(ElastigroupProcess.AUTO_SCALE_DOWN)
-        spotinst_client.suspend_scaling_policies.assert_called_with(
-            "sig-12345678", ["SCALING_POLICY_DOWN_1", "SCALING_POLICY_DOWN_2"]
+        spotinst_client.suspend_scaling_policies.assert_has_calls(
+            [
+                unittest.mock.call("sig-12345678", "SCALING_POLICY_DOWN_1"),
+                unittest.mock.call("sig-12345678", "SCALING_POLICY_DOWN_2"),
+            ]
         )
+        assert spotinst_client.suspend_scaling_policies.call_count == 2
 
     def test_elastigroup_unsuspend_process(_, arrange_elastigroup):
         spotinst_client, elastigroup = arrange_elastigroup
@@ -136,9 +173,31 @@ class ElastigroupTests:
     def test_elastigroup_unsuspend_scaling_policy(_, arrange_elastigroup):
         spotinst_client, elastigroup = arrange_elastigroup
         elastigroup.unsuspend(ElastigroupProcess.AUTO_SCALE_DOWN)
-        spotinst_client.resume_suspended_scaling_policies.assert_called_with(
-            "sig-12345678", ["SCALING_POLICY_DOWN_1", "SCALING_POLICY_DOWN_2"]
+        spotinst_client.resume_suspended_scaling_policies.assert_has_calls(
+            [
+                unittest.mock.call("sig-12345678", "SCALING_POLICY_DOWN_1"),
+                unittest.mock.call("sig-12345678", "SCALING_POLICY_DOWN_2"),
+            ]
+        )
+        assert spotinst_client.resume_suspended_scaling_policies.call_count == 2
+
+    def test_elastigroup_suspend_many(_, arrange_elastigroup):
+        spotinst_client, elastigroup = arrange_elastigroup
+        elastigroup.suspend_many(["AUTO_HEALING", "SCHEDULING", "AUTO_SCALE_UP"])
+        spotinst_client.suspend_process.assert_called_once_with(
+            "sig-12345678", ["AUTO_HEALING", "SCHEDULING"], None
+        )
+        spotinst_client.suspend_scaling_policies.assert_called_once_with(
+            "sig-12345678", "SCALING_POLICY_UP_1"
+        )
+
+    def test_elastigroup_unsuspend_many(_, arrange_elastigroup):
+        spotinst_client, elastigroup = arrange_elastigroup
+        elastigroup.unsuspend_many([ElastigroupProcess.AUTO_HEALING])
+        spotinst_client.remove_suspended_process.assert_called_once_with(
+            "sig-12345678", ["AUTO_HEALING"]
         )
+        spotinst_client.resume_suspended_scaling_policies.assert_not_called()
 
     @pytest.mark.parametrize("amount", [10, "10%"])
     def test_elastigroup_scale_up(_, amount, arrange_elastigroup):
@@ -163,7 +222,7 @@ class ElastigroupTests:
     )
     def test_elastigroup_set_capacity(_, capacity, arrange_elastigroup):
         spotinst_client, elastigroup = arrange_elastigroup
-        elastigroup.set_capacity(capacity)
+        elastigroup.capacity = capacity
         spotinst_client.update_elastigroup.assert_called_with(
             {"capacity": capacity}, "sig-12345678"
         )
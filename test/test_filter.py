@@ -0,0 +1,25 @@
+import pytest
+
+from spotcli.utils import filter
+
+
+@pytest.mark.unit
+class FilterTests:
+    @pytest.mark.parametrize(
+        "query",
+        [
+            ("is-bidder", {"is-bidder", "is-bidder-haproxy"}),
+            (["is-bidder$", "rv-"], {"is-bidder", "rv-bidder"}),
+            ("IS-BIDDER$", {"is-bidder"}),
+            (["(is|rv)-bidder(?!.*haproxy)"], {"is-bidder", "rv-bidder"}),
+        ],
+    )
+    def test_filters_items(self, query):
+        items = ["is-bidder", "is-bidder-haproxy", "rv-bidder", "web"]
+        assert filter(items, query[0]) == query[1]
+
+    def test_backreferences_match_their_own_query(self):
+        assert filter(["aa-web", "xy"], ["(x)y", r"(a)\1"]) == {"aa-web", "xy"}
+
+    def test_invalid_combination_falls_back(self):
+        assert filter(["web", "api"], ["(?i)WEB", "api"]) == {"web", "api"}
@@ -1,20 +1,32 @@
-from spotcli.providers import SpotProvider
+import threading
+import time
 import unittest.mock
-import pytest
 
-import spotinst_sdk
+import pytest
 
-from spotcli.tasks import (
+from spotcli.configuration.tasks import (
     Alias,
-    TargetList,
-    Task,
-    RollTask,
-    UpscaleTask,
+    Amount,
     DownscaleTask,
+    RollTask,
+    Scenario,
     SuspendTask,
+    TargetList,
+    Task,
     UnsuspendTask,
+    UpscaleTask,
 )
-from spotcli.elastigroup import Elastigroup, ElastigroupProcess
+from spotcli.utils.elastigroup import Elastigroup, ElastigroupProcess
+
+
+def make_target(name, id=None, error=None):
+    target = unittest.mock.MagicMock()
+    target.name = name
+    target.id = id or f"sig-{name}"
+    if error is not None:
+        target.roll.side_effect = error
+        target.scale_up.side_effect = error
+    return target
 
 
 @pytest.mark.unit
@@ -38,55 +50,254 @@ class TasksTests:
 
     @unittest.mock.patch.object(Elastigroup, "find")
     def test_target_list_finds_elastigroups(self, fake_find):
-        spot = SpotProvider(name="spot", kind="spot", account="act-12345678", token="deadbeefdeadbeef")
+        spot = unittest.mock.MagicMock()
         targets = ["a", "b", "c", "d", "e"]
         TargetList(spot, dict(), targets).data
-        calls = [unittest.mock.call(spot, i) for i in targets]
-        fake_find.assert_has_calls(calls)
+        fake_find.assert_called_once_with(spot.client(), targets)
 
     @unittest.mock.patch.object(Elastigroup, "find")
     def test_target_list_resolves_aliases(self, fake_find):
-        spot = SpotProvider(name="spot", kind="spot", account="act-12345678", token="deadbeefdeadbeef")
+        spot = unittest.mock.MagicMock()
         aliases = {
-            "testA": Alias("test", ["a", "b", "c"]),
+            "testA": Alias("testA", ["a", "b", "c"]),
             "testB": Alias("testB", ["testA", "d", "e"]),
         }
         TargetList(spot, aliases, ["testB"]).data
-        calls = [unittest.mock.call(spot, i) for i in ["a", "b", "c", "d", "e"]]
-        fake_find.assert_has_calls(calls)
+        fake_find.assert_called_once_with(spot.client(), ["a", "b", "c", "d", "e"])
+
+    @unittest.mock.patch.object(Elastigroup, "find")
+    def test_target_list_resolves_once(self, fake_find):
+        target_list = TargetList(unittest.mock.MagicMock(), dict(), ["a"])
+        list(target_list)
+        list(target_list)
+        fake_find.assert_called_once()
+
+    def test_target_list_expands_repeated_aliases(self):
+        aliases = {
+            "testA": Alias("testA", ["a", "b"]),
+            "testB": Alias("testB", ["testA", "c", "testA"]),
+        }
+        target_list = TargetList(unittest.mock.MagicMock(), aliases, ["testB", "testA"])
+        assert target_list.flatten() == ["a", "b", "c", "a", "b", "a", "b"]
+
+    @pytest.mark.parametrize(
+        "aliases",
+        [
+            {"testA": Alias("testA", ["testA"])},
+            {
+                "testA": Alias("testA", ["a", "testB"]),
+                "testB": Alias("testB", [["testA"]]),
+            },
+        ],
+    )
+    def test_target_list_detects_circular_aliases(self, aliases):
+        with pytest.raises(SystemExit):
+            TargetList(unittest.mock.MagicMock(), aliases, ["testA"]).flatten()
 
     def test_task_factory_instantiates_correct_classes(self):
-        assert isinstance(Task(kind="roll", targets=[]), RollTask)
-        assert isinstance(Task(kind="upscale", targets=[], amount=1), UpscaleTask)
-        assert isinstance(Task(kind="downscale", targets=[], amount=1), DownscaleTask)
+        assert isinstance(Task.create(kind="roll", targets=[]), RollTask)
+        assert isinstance(
+            Task.create(kind="upscale", targets=[], amount=1), UpscaleTask
+        )
         assert isinstance(
-            Task(kind="suspend", targets=[], processes=[ElastigroupProcess.AUTO_HEALING]),
+            Task.create(kind="downscale", targets=[], amount=1), DownscaleTask
+        )
+        assert isinstance(
+            Task.create(
+                kind="suspend", targets=[], processes=[ElastigroupProcess.AUTO_HEALING]
+            ),
             SuspendTask,
         )
         assert isinstance(
-            Task(kind="unsuspend", targets=[], processes=[ElastigroupProcess.AUTO_HEALING]),
+            Task.create(kind="unsuspend", targets=[], processes=["AUTO_HEALING"]),
             UnsuspendTask,
         )
 
+    def test_task_factory_rejects_unknown_kinds(self):
+        with pytest.raises(SystemExit):
+            Task.create(kind="reboot", targets=[])
+
+    @pytest.mark.parametrize(
+        "amount",
+        [
+            (20, Amount(20, False), "20", "20 instances"),
+            ("20", Amount(20, False), "20", "20 instances"),
+            (" 15% ", Amount(15, True), "15%", "15%"),
+            (Amount(5, True), Amount(5, True), "5%", "5%"),
+        ],
+    )
+    def test_tasks_parse_amounts(self, amount):
+        task = Task.create(kind="upscale", targets=[], amount=amount[0])
+        assert task.amount == amount[1]
+        assert str(task.amount) == amount[2]
+        assert task.amount.label == amount[3]
+
+    def test_roll_task_defaults_batch(self):
+        assert Task.create(kind="roll", targets=[]).batch == Amount(20, True)
+
+    @pytest.mark.parametrize("amount", ["", "ten", "10%%", "%"])
+    def test_tasks_reject_invalid_amounts(self, amount):
+        with pytest.raises(SystemExit):
+            Task.create(kind="downscale", targets=[], amount=amount)
+
+    def test_tasks_reject_invalid_processes_on_creation(self):
+        with pytest.raises(SystemExit):
+            Task.create(kind="suspend", targets=[], processes=["AUTO_HEALIN"])
+
     def test_tasks_call_correct_methods(self):
-        mock_elastigroup = unittest.mock.MagicMock()
+        mock_elastigroup = make_target("test")
 
-        Task(kind="roll", targets=[mock_elastigroup]).run()
-        Task(kind="upscale", targets=[mock_elastigroup], amount=1).run()
-        Task(kind="downscale", targets=[mock_elastigroup], amount=1).run()
-        Task(
+        Task.create(kind="roll", targets=[mock_elastigroup]).run()
+        Task.create(kind="upscale", targets=[mock_elastigroup], amount=1).run()
+        Task.create(kind="downscale", targets=[mock_elastigroup], amount="10%").run()
+        Task.create(
             kind="suspend",
             targets=[mock_elastigroup],
             processes=[ElastigroupProcess.AUTO_HEALING],
         ).run()
-        Task(
+        Task.create(
             kind="unsuspend",
             targets=[mock_elastigroup],
-            processes=[ElastigroupProcess.AUTO_HEALING],
+            processes=["AUTO_HEALING", "AUTO_SCALE_UP"],
         ).run()
 
-        mock_elastigroup.roll.assert_called_with(None, None)
-        mock_elastigroup.scale_up.assert_called_with(1)
-        mock_elastigroup.scale_down.assert_called_with(1)
-        mock_elastigroup.suspend.assert_called_with(ElastigroupProcess.AUTO_HEALING)
-        mock_elastigroup.unsuspend.assert_called_with(ElastigroupProcess.AUTO_HEALING)
+        mock_elastigroup.roll.assert_called_with("20%", "")
+        mock_elastigroup.scale_up.assert_called_with("1")
+        mock_elastigroup.scale_down.assert_called_with("10%")
+        mock_elastigroup.suspend_many.assert_called_with(
+            [ElastigroupProcess.AUTO_HEALING]
+        )
+        mock_elastigroup.unsuspend_many.assert_called_with(
+            [ElastigroupProcess.AUTO_HEALING, ElastigroupProcess.AUTO_SCALE_UP]
+        )
+
+    def test_tasks_return_results(self):
+        error = RuntimeError("boom")
+        targets = [make_target("a"), make_target("b", error=error)]
+        results = Task.create(kind="roll", targets=targets).run()
+        assert sorted(results, key=lambda result: result[0]) == [
+            ("a", None),
+            ("b", error),
+        ]
+
+    def test_collect_cancels_pending_work_on_failure(self):
+        done = unittest.mock.MagicMock()
+        done.cancelled.return_value = False
+        done.result.return_value = ("a", RuntimeError("boom"))
+        pending = unittest.mock.MagicMock()
+        with unittest.mock.patch(
+            "spotcli.configuration.tasks.as_completed", return_value=[done]
+        ):
+            results = Task.collect([done, pending], fail_fast=True)
+        assert [name for name, _ in results] == ["a"]
+        pending.cancel.assert_called_once_with()
+
+    def test_collect_keeps_going_without_fail_fast(self):
+        error = RuntimeError("boom")
+        targets = [make_target(name, error=error) for name in "abc"]
+        results = Task.create(kind="roll", targets=targets).run(fail_fast=False)
+        assert len(results) == 3
+
+    @unittest.mock.patch.object(
+        Elastigroup, "find", side_effect=lambda spot, names: list(names)
+    )
+    def test_scenario_resolves_common_targets_once(self, fake_find):
+        spot = unittest.mock.MagicMock()
+        aliases = {"web": Alias("web", ["a", "b"])}
+        tasks = [
+            Task.create(kind="roll", targets=TargetList(spot, aliases, ["web"])),
+            Task.create(
+                kind="upscale", targets=TargetList(spot, aliases, ["b", "a"]), amount=1
+            ),
+            Task.create(
+                kind="downscale", targets=TargetList(spot, aliases, ["c"]), amount=1
+            ),
+        ]
+        Scenario(name="test", tasks=tasks).resolve()
+        assert fake_find.call_count == 2
+        assert tasks[0].targets.data is tasks[1].targets.data
+        assert tasks[2].targets.data == ["c"]
+
+
+@pytest.mark.unit
+@pytest.mark.tasks
+class ScenarioTests:
+    @pytest.fixture(autouse=True)
+    def skip_resolve(self):
+        with unittest.mock.patch.object(Scenario, "resolve"):
+            yield
+
+    def test_scenario_runs_all_tasks(self):
+        target = make_target("a")
+        scenario = Scenario(
+            name="test",
+            tasks=[
+                Task.create(kind="roll", targets=[target]),
+                Task.create(kind="upscale", targets=[target], amount=1),
+            ],
+        )
+        assert scenario.run() == [("a", None), ("a", None)]
+        assert scenario.executed == 2
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_scenario_fail_fast_skips_remaining_tasks(self, parallel):
+        error = RuntimeError("boom")
+        failing = make_target("a", error=error)
+        other = make_target("b")
+        scenario = Scenario(
+            name="test",
+            tasks=[
+                Task.create(kind="roll", targets=[failing]),
+                Task.create(kind="upscale", targets=[failing, other], amount=1),
+            ],
+            parallel=parallel,
+        )
+        assert scenario.run(fail_fast=True) == [("a", error)]
+        assert scenario.executed == 1
+        other.scale_up.assert_not_called()
+
+    def test_scenario_fail_fast_defaults_to_scenario_setting(self):
+        error = RuntimeError("boom")
+        target = make_target("a", error=error)
+        tasks = [
+            Task.create(kind="roll", targets=[target]),
+            Task.create(kind="roll", targets=[target]),
+        ]
+        assert len(Scenario(name="test", tasks=tasks, fail_fast=True).run()) == 1
+        assert len(Scenario(name="test", tasks=tasks).run()) == 2
+        assert len(Scenario(name="test", tasks=tasks, fail_fast=True).run(False)) == 2
+
+    def test_parallel_scenario_orders_tasks_with_common_targets(self):
+        events = []
+        lock = threading.Lock()
+
+        def record(name, delay=0.0):
+            def side_effect(*args):
+                with lock:
+                    events.append(f"{name} start")
+                time.sleep(delay)
+                with lock:
+                    events.append(f"{name} end")
+
+            return side_effect
+
+        shared = make_target("shared")
+        shared.roll.side_effect = record("roll shared", 0.2)
+        shared.scale_up.side_effect = record("upscale shared")
+        other = make_target("other")
+        other.scale_down.side_effect = record("downscale other")
+        scenario = Scenario(
+            name="test",
+            tasks=[
+                Task.create(kind="roll", targets=[shared]),
+                Task.create(kind="upscale", targets=[shared], amount=1),
+                Task.create(kind="downscale", targets=[other], amount=1),
+            ],
+            parallel=True,
+        )
+        results = scenario.run()
+        # Results keep task order
+        assert results == [("shared", None), ("shared", None), ("other", None)]
+        assert events.index("roll shared end") < events.index("upscale shared start")
+        # Tasks without common targets don't wait
+        assert events.index("downscale other end") < events.index("roll shared end")